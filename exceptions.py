@@ -1,4 +0,0 @@
-class DictIsEmptyError(Exception):
-    """Ошибка при пустом cловаре ответа API."""
-
-    pass
@@ -1,4 +1,6 @@
 import os
+import random
+import sys
 import time
 from http import HTTPStatus
 
@@ -6,30 +8,53 @@ import logging
 import requests
 import telegram
 from dotenv import load_dotenv
-
-from exceptions import DictIsEmptyError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+if not isinstance(logging.getLevelName(LOG_LEVEL), int):
+    LOG_LEVEL = 'INFO'
+
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=LOG_LEVEL,
     format='%(asctime)s, [%(levelname)s] %(message)s',
     handlers=[logging.StreamHandler()]
 )
+logging.getLogger('urllib3').setLevel(logging.WARNING)
 
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_TIME = 600
+BACKOFF_BASE = 2
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+REQUEST_TIMEOUT = (5, 30)
+# Заголовки условного запроса и Last-Modified последнего полученного ответа.
+CONDITIONAL_HEADERS = {}
+RECEIVED_HEADERS = {}
+
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    max_retries=Retry(total=3, backoff_factor=1,
+                      status_forcelist=(502, 503, 504))
+))
 
 HOMEWORK_STATUSES = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+STATUS_MESSAGES = {
+    status: ('Изменился статус проверки работы "{name}". ' + verdict
+             + ' Комментарий ревьювера: {comment}.')
+    for status, verdict in HOMEWORK_STATUSES.items()
+}
 
 
 def send_message(bot, message):
@@ -37,50 +62,88 @@ def send_message(bot, message):
     try:
         bot.send_message(TELEGRAM_CHAT_ID, message)
     except Exception as telegram_error:
-        message = (f'Сбой в работе программы: Отправка сообщения в чат не'
-                   f'удалась. {telegram_error}')
-        logging.error(message)
+        logging.error('Сбой в работе программы: Отправка сообщения в чат не '
+                      'удалась. %s', telegram_error)
     else:
-        logging.info(f'Сообщение успешно отправлено: "{message}"')
+        logging.info('Сообщение успешно отправлено: "%s"', message)
 
 
 def get_api_answer(current_timestamp):
-    """Получение ответа от API Практикум."""
+    """Получение ответа от API Практикум или None, если он не изменился."""
     timestamp = current_timestamp or int(time.time())
     params = {'from_date': timestamp}
-    response = requests.get(ENDPOINT, headers=HEADERS, params=params)
+    headers = {**HEADERS, **CONDITIONAL_HEADERS}
+    try:
+        response = SESSION.get(ENDPOINT, headers=headers, params=params,
+                               timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as error:
+        logging.warning('Ошибка запроса к %s: %s', ENDPOINT, error)
+        raise ConnectionError(
+            f'Эндпоинт {ENDPOINT} недоступен. '
+            f'Ошибка запроса: {type(error).__name__}'
+        ) from error
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        return None
     if response.status_code != HTTPStatus.OK:
         raise ConnectionError(
             f'Эндпоинт {response.url} недоступен. '
             f'Код ответа API: {response.status_code}'
         )
+    RECEIVED_HEADERS['Last-Modified'] = response.headers.get('Last-Modified')
     return response.json()
 
 
+def remember_last_modified():
+    """Передача Last-Modified принятого ответа в следующий запрос к API."""
+    last_modified = RECEIVED_HEADERS.pop('Last-Modified', None)
+    if last_modified:
+        CONDITIONAL_HEADERS['If-Modified-Since'] = last_modified
+    else:
+        CONDITIONAL_HEADERS.pop('If-Modified-Since', None)
+
+
 def check_response(response):
     """Проверка правильности формата ответа от API Практикума."""
-    if type(response) is not dict:
+    if not isinstance(response, dict):
         raise TypeError(f'Неверный тип данных ответа API Практикума. Ожидался '
                         f'dict, получен {type(response)}')
-    elif len(response) < 1:
-        raise DictIsEmptyError('Словарь ответа API пуст')
-    elif 'homeworks' not in response:
+    try:
+        homeworks = response['homeworks']
+    except KeyError:
         raise KeyError('Ключа homeworks нет в ответе API')
-    elif type(response['homeworks']) is not list:
+    if not isinstance(homeworks, list):
         raise TypeError('homeworks не является списком')
-    return response['homeworks']
+    return homeworks
 
 
 def parse_status(homework):
     """Получение статуса домашней работы из списка работ."""
-    homework_name = homework.get('homework_name')
     homework_status = homework.get('status')
-    reviewer_comment = homework.get('reviewer_comment')
-    if homework_status not in HOMEWORK_STATUSES:
+    template = STATUS_MESSAGES.get(homework_status)
+    if template is None:
         raise KeyError(f'Неверный статус работы: {homework_status}')
-    verdict = HOMEWORK_STATUSES[homework_status]
-    return (f'Изменился статус проверки работы "{homework_name}". {verdict} '
-            f'Комментарий ревьювера: {reviewer_comment}.')
+    return template.format(
+        name=homework.get('homework_name'),
+        comment=homework.get('reviewer_comment')
+    )
+
+
+def get_status_key(homework):
+    """Ключ для сравнения статуса работы с последним отправленным."""
+    return homework.get('homework_name'), homework.get('status')
+
+
+def send_new_status(bot, homeworks, last_status):
+    """Отправка статуса последней работы, если он ещё не отправлялся."""
+    if not homeworks:
+        logging.debug('Новые статусы отсутствуют')
+        return last_status
+    status_key = get_status_key(homeworks[0])
+    if status_key == last_status:
+        logging.debug('Статус работы не изменился')
+        return last_status
+    send_message(bot, parse_status(homeworks[0]))
+    return status_key
 
 
 def check_tokens():
@@ -94,49 +157,69 @@ def check_tokens():
     return True
 
 
-def error_log_and_message(bot, error, cache_message):
-    """Логирование ошибок и отправка сообщения об ошибке в чат."""
+def flush_error_cache(bot, error_cache):
+    """Отправка сводки о повторах последней ошибки и сброс кэша ошибок."""
+    cache_message, count, first_seen = error_cache
+    if count > 1:
+        send_message(bot, f'{cache_message} (произошла {count} раз(а) '
+                          f'за {int(time.time()) - first_seen} с)')
+    return '', 0, 0
+
+
+def error_log_and_message(bot, error, error_cache):
+    """Логирование ошибки и отправка в чат, если она отличается от прошлой."""
     message = f'Сбой в работе программы: {error}'
     logging.error(message)
-    if cache_message != message:
-        send_message(bot, message)
-        cache_message = message
-    time.sleep(RETRY_TIME)
-    return cache_message
+    cache_message, count, first_seen = error_cache
+    if cache_message == message:
+        return cache_message, count + 1, first_seen
+    flush_error_cache(bot, error_cache)
+    send_message(bot, message)
+    return message, 1, int(time.time())
+
+
+def get_retry_time(attempt):
+    """Расчёт паузы перед повторным запросом к API после сбоя."""
+    retry_time = min(RETRY_TIME, BACKOFF_BASE ** attempt)
+    return random.uniform(retry_time / 2, retry_time)
 
 
 def main():
     """Основная логика работы бота."""
+    if not check_tokens():
+        sys.exit(1)
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
     current_timestamp = int(time.time())
-    cache_message = ''
+    error_cache = ('', 0, 0)
+    last_status = None
+    failed_attempts = 0
 
-    while check_tokens():
+    while True:
+        retry_time = RETRY_TIME
         try:
             response = get_api_answer(current_timestamp)
         except ConnectionError as error:
-            cache_message = error_log_and_message(bot, error, cache_message)
+            error_cache = error_log_and_message(bot, error, error_cache)
+            failed_attempts += 1
+            retry_time = get_retry_time(failed_attempts)
         else:
-            try:
-                homeworks = check_response(response)
-            except (KeyError, TypeError, DictIsEmptyError) as error:
-                cache_message = error_log_and_message(
-                    bot, error, cache_message
-                )
+            failed_attempts = 0
+            if response is None:
+                logging.debug('Ответ API не изменился')
+                error_cache = flush_error_cache(bot, error_cache)
             else:
-                if len(homeworks) > 0:
-                    try:
-                        message = parse_status(homeworks[0])
-                    except KeyError as error:
-                        cache_message = error_log_and_message(
-                            bot, error, cache_message
-                        )
-                    else:
-                        send_message(bot, message)
-                else:
-                    logging.debug('Новые статусы отсутствуют')
-                current_timestamp = response.get('current_date')
-                time.sleep(RETRY_TIME)
+                try:
+                    homeworks = check_response(response)
+                    remember_last_modified()
+                    current_timestamp = (response.get('current_date')
+                                         or current_timestamp)
+                    last_status = send_new_status(bot, homeworks, last_status)
+                    error_cache = flush_error_cache(bot, error_cache)
+                except (KeyError, TypeError) as error:
+                    error_cache = error_log_and_message(
+                        bot, error, error_cache
+                    )
+        time.sleep(retry_time)
 
 
 if __name__ == '__main__':
@@ -19,3 +19,13 @@ def current_timestamp():
 @pytest.fixture
 def api_url():
     return 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+
+
+@pytest.fixture(autouse=True)
+def clear_conditional_headers():
+    import homework
+    homework.CONDITIONAL_HEADERS.clear()
+    homework.RECEIVED_HEADERS.clear()
+    yield
+    homework.CONDITIONAL_HEADERS.clear()
+    homework.RECEIVED_HEADERS.clear()
@@ -1,6 +1,7 @@
 import os
 from http import HTTPStatus
 
+import pytest
 import requests
 import telegram
 import utils
@@ -44,6 +45,7 @@ class MockResponseGET:
         )
         self.random_timestamp = random_timestamp
         self.status_code = http_status
+        self.headers = {}
 
     def json(self):
         data = {
@@ -73,6 +75,58 @@ class MockTelegramBot:
         return self.random_timestamp
 
 
+class RecordingTelegramBot:
+
+    def __init__(self, *args, **kwargs):
+        self.messages = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.messages.append(text)
+
+
+class StopMainLoop(Exception):
+    pass
+
+
+def run_main(monkeypatch, payloads, last_modified=None):
+    """Runs homework.main() once per payload and returns sent data"""
+    import homework
+
+    bot = RecordingTelegramBot()
+    from_dates = []
+    sent_headers = []
+    iterations = iter(payloads)
+
+    def mock_response_get(*args, params=None, **kwargs):
+        from_dates.append(params['from_date'])
+        sent_headers.append(kwargs['headers'])
+        response = MockResponseGET(
+            *args, params=params, current_timestamp=params['from_date'],
+            **kwargs
+        )
+        if last_modified:
+            response.headers = {'Last-Modified': last_modified}
+        payload = next(iterations)
+        response.json = lambda: payload
+        return response
+
+    def mock_sleep(seconds):
+        if len(from_dates) == len(payloads):
+            raise StopMainLoop
+
+    monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 'sometoken')
+    monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+    monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+    monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+    monkeypatch.setattr(homework.telegram, 'Bot', lambda token: bot)
+    monkeypatch.setattr(homework.time, 'sleep', mock_sleep)
+    try:
+        homework.main()
+    except StopMainLoop:
+        pass
+    return bot.messages, from_dates, sent_headers
+
+
 class TestHomework:
     HOMEWORK_STATUSES = {
         'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -178,6 +232,44 @@ class TestHomework:
         import homework
         utils.check_function(homework, 'send_message', 2)
 
+    def test_error_log_and_message(self):
+        import homework
+
+        func_name = 'error_log_and_message'
+        utils.check_function(homework, func_name, 3)
+        bot = RecordingTelegramBot()
+        error_cache = ('', 0, 0)
+        for error in ('A', 'A', 'B'):
+            error_cache = homework.error_log_and_message(
+                bot, error, error_cache
+            )
+        assert len(bot.messages) == 3, (
+            f'Убедитесь, что функция `{func_name}` отправляет первую ошибку, '
+            'сводку о её повторах и новую ошибку'
+        )
+        assert bot.messages[0].endswith('A')
+        assert 'произошла 2 раз(а)' in bot.messages[1], (
+            f'Убедитесь, что функция `{func_name}` отправляет сводку '
+            'о повторах предыдущей ошибки при появлении новой'
+        )
+        assert bot.messages[2].endswith('B')
+
+    def test_flush_error_cache(self):
+        import homework
+
+        func_name = 'flush_error_cache'
+        bot = RecordingTelegramBot()
+        error_cache = homework.error_log_and_message(bot, 'A', ('', 0, 0))
+        error_cache = homework.flush_error_cache(bot, error_cache)
+        assert error_cache == ('', 0, 0), (
+            f'Убедитесь, что функция `{func_name}` сбрасывает кэш ошибок'
+        )
+        homework.error_log_and_message(bot, 'A', error_cache)
+        assert len(bot.messages) == 2, (
+            'Убедитесь, что ошибка, повторившаяся после восстановления, '
+            'снова отправляется в чат'
+        )
+
     def test_get_api_answers(self, monkeypatch, random_timestamp,
                              current_timestamp, api_url):
         def mock_response_get(*args, **kwargs):
@@ -186,10 +278,10 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'get_api_answer'
         utils.check_function(homework, func_name, 1)
 
@@ -232,10 +324,10 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_500_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_500_response_get)
+
         func_name = 'get_api_answer'
         try:
             homework.get_api_answer(current_timestamp)
@@ -247,6 +339,84 @@ class TestHomework:
                 'когда API возвращает код, отличный от 200'
             )
 
+    def test_get_api_answer_request_error(self, monkeypatch, caplog,
+                                          current_timestamp):
+        def mock_timeout_get(*args, **kwargs):
+            raise requests.Timeout(
+                'HTTPSConnectionPool: Read timed out. <object at 0x7fe1>'
+            )
+
+        import homework
+
+        monkeypatch.setattr(homework.SESSION, 'get', mock_timeout_get)
+
+        func_name = 'get_api_answer'
+        with pytest.raises(ConnectionError) as error:
+            homework.get_api_answer(current_timestamp)
+        assert '0x' not in str(error.value), (
+            f'Убедитесь, что сообщение об ошибке в функции `{func_name}` '
+            'не меняется от попытки к попытке'
+        )
+        assert 'Read timed out' in caplog.text, (
+            f'Убедитесь, что функция `{func_name}` логирует '
+            'исходную ошибку запроса'
+        )
+
+    def test_get_retry_time(self):
+        import homework
+
+        func_name = 'get_retry_time'
+        utils.check_function(homework, func_name, 1)
+        for attempt in range(1, 15):
+            upper = min(homework.BACKOFF_BASE ** attempt, homework.RETRY_TIME)
+            retry_time = homework.get_retry_time(attempt)
+            assert upper / 2 <= retry_time <= upper, (
+                f'Проверьте, что функция `{func_name}` возвращает паузу '
+                f'от {upper / 2} до {upper} с для попытки {attempt}'
+            )
+            assert retry_time <= homework.RETRY_TIME, (
+                f'Проверьте, что функция `{func_name}` не возвращает паузу '
+                'больше RETRY_TIME'
+            )
+
+    def test_get_304_api_answer(self, monkeypatch, random_timestamp,
+                                current_timestamp, api_url):
+        def mock_304_response_get(*args, **kwargs):
+            return MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp,
+                http_status=HTTPStatus.NOT_MODIFIED, **kwargs
+            )
+
+        import homework
+
+        monkeypatch.setattr(homework.SESSION, 'get', mock_304_response_get)
+
+        func_name = 'get_api_answer'
+        result = homework.get_api_answer(current_timestamp)
+        assert result is None, (
+            f'Убедитесь, что функция `{func_name}` возвращает None, '
+            'когда API отвечает кодом 304'
+        )
+
+    def test_main_remembers_last_modified(self, monkeypatch,
+                                          random_timestamp):
+        last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+        payloads = [
+            {'current_date': random_timestamp},
+            {'homeworks': [], 'current_date': random_timestamp},
+            {'homeworks': [], 'current_date': random_timestamp},
+        ]
+        _, _, sent_headers = run_main(monkeypatch, payloads, last_modified)
+        assert 'If-Modified-Since' not in sent_headers[1], (
+            'Убедитесь, что Last-Modified некорректного ответа API '
+            'не передаётся в следующий запрос'
+        )
+        assert sent_headers[2].get('If-Modified-Since') == last_modified, (
+            'Убедитесь, что после корректного ответа API в следующий '
+            'запрос передаётся If-Modified-Since'
+        )
+
     def test_parse_status(self, random_timestamp):
         test_data = {
             "id": 123,
@@ -315,10 +485,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'check_response'
         response = homework.get_api_answer(current_timestamp)
         status = homework.check_response(response)
@@ -352,10 +522,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'parse_status'
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -400,10 +570,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'parse_status'
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -448,10 +618,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'parse_status'
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -466,6 +636,45 @@ class TestHomework:
                 'при отсутствии ключа `homework_name` в ответе от API'
             )
 
+    def test_main_sends_status_once(self, monkeypatch, random_timestamp):
+        homework = {'homework_name': 'hw123', 'status': 'approved'}
+        payloads = [
+            {'homeworks': [homework], 'current_date': random_timestamp},
+            {'homeworks': [homework], 'current_date': random_timestamp},
+            {'homeworks': [dict(homework, status='rejected')],
+             'current_date': random_timestamp},
+        ]
+        messages, _, _ = run_main(monkeypatch, payloads)
+        assert len(messages) == 2, (
+            'Убедитесь, что бот не отправляет повторно статус работы, '
+            'который не изменился'
+        )
+
+    def test_main_sends_unknown_status_error_once(self, monkeypatch,
+                                                  random_timestamp):
+        payloads = [
+            {'homeworks': [{'homework_name': 'hw123', 'status': 'weird'}],
+             'current_date': random_timestamp}
+        ] * 4
+        messages, _, _ = run_main(monkeypatch, payloads)
+        assert len(messages) == 1, (
+            'Убедитесь, что одна и та же ошибка разбора статуса '
+            'отправляется в чат только один раз'
+        )
+
+    def test_main_keeps_timestamp_without_current_date(self, monkeypatch,
+                                                       random_timestamp):
+        payloads = [
+            {'homeworks': [], 'current_date': random_timestamp},
+            {'homeworks': []},
+            {'homeworks': []},
+        ]
+        _, from_dates, _ = run_main(monkeypatch, payloads)
+        assert from_dates[1:] == [random_timestamp, random_timestamp], (
+            'Убедитесь, что при отсутствии `current_date` в ответе API '
+            'следующий запрос использует предыдущий timestamp'
+        )
+
     def test_check_response_no_homeworks(self, monkeypatch, random_timestamp,
                                          current_timestamp, api_url):
         def mock_no_homeworks_response_get(*args, **kwargs):
@@ -484,10 +693,10 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_no_homeworks_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_no_homeworks_response_get)
+
         func_name = 'check_response'
         result = homework.get_api_answer(current_timestamp)
         try:
@@ -525,10 +734,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'check_response'
         response = homework.get_api_answer(current_timestamp)
         try:
@@ -565,10 +774,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'check_response'
         response = homework.get_api_answer(current_timestamp)
         try:
@@ -599,10 +808,10 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_empty_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_empty_response_get)
+
         func_name = 'check_response'
         result = homework.get_api_answer(current_timestamp)
         try:
@@ -626,10 +835,10 @@ class TestHomework:
             )
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'check_response'
         try:
             homework.get_api_answer(current_timestamp)